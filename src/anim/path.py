@@ -2,11 +2,45 @@ import logging
 
 import numpy as np
 import xarray as xr
-from scipy import interpolate
 
 logger = logging.getLogger(__name__)
 
 
+def _hermite_eval(dates, coeffs, new_dates):
+    """evaluate piecewise cubic polynomials on new dates
+
+    Parameters
+    ----------
+    dates : numpy.ndarray
+        knots, shape (N,)
+    coeffs : tuple
+        c0, c1, c2, c3 polynomial coefficients of each segment, each of shape (N-1, M)
+    new_dates : numpy.ndarray
+        sorted dates where polynomials are evaluated, shape (K,). Should be within [dates[0], dates[-1]]
+
+    Returns
+    -------
+    numpy.ndarray
+        values, shape (K, M)
+    """
+    c0, c1, c2, c3 = coeffs
+
+    # segment of each new date (computed once for all variables), and position within this segment.
+    # new dates are sorted, so it is enough to find where each inner knot falls among them,
+    # then segment `j` is repeated for every new date between knots `j` and `j+1`
+    bounds = np.searchsorted(new_dates, dates[1:-1], side="left")
+    counts = np.diff(bounds, prepend=0, append=new_dates.size)
+    i = np.repeat(np.arange(dates.size - 1), counts)
+    u = (new_dates - dates[i])[:, None]
+
+    # horner scheme, computed in place : ((c3*u + c2)*u + c1)*u + c0
+    out = c3[i]
+    for c in (c2, c1, c0):
+        out *= u
+        out += c[i]
+    return out
+
+
 class Path:
     """Generate camera path for the animation.
 
@@ -49,10 +83,22 @@ class Path:
 
     def __init__(self, coords=(180, 0), dx=180, dy=90, t0=0):
         self._sanitize_coords(coords)
-        self._times = [t0]
-        self._coords = [coords]
-        self._dxs = [dx]
-        self._dys = [dy]
+        # knots are stored in growing buffers (one per variable), only the `_n` first values are used
+        self._n = 0
+        self._t = np.empty(16, dtype=np.asarray(t0).dtype)
+        self._x = np.empty(16, dtype=np.float64)
+        self._y = np.empty(16, dtype=np.float64)
+        self._dx = np.empty(16, dtype=np.float64)
+        self._dy = np.empty(16, dtype=np.float64)
+        # hermite coefficients of each segment, shape (4, capacity, 4) : (c0..c3, segment, variable).
+        # only the `_n_coeffs` first segments are up to date
+        self._coeffs = np.empty((4, 16, 4), dtype=np.float64)
+        self._n_coeffs = 0
+        # unit of the dates the coefficients were computed with
+        self._coeffs_unit = None
+        # last interpolated path, as (dt key, path). Reset each time a knot is added
+        self._path_cache = None
+        self._extend([t0], [coords[0]], [coords[1]], [dx], [dy])
 
     @classmethod
     def _sanitize_coords(cls, coords):
@@ -60,73 +106,254 @@ class Path:
             logger.error(f"coords shoud be None or a tuple(x,y), not {type(coords)}")
             raise TypeError("coords bad type")
 
+    @classmethod
+    def _sanitize_many(cls, name, values, shape):
+        try:
+            values = np.asarray(values, dtype=np.float64)
+        except (TypeError, ValueError) as err:
+            logger.error(f"{name} should be an array of numbers, not {values!r}")
+            raise TypeError(f"{name} bad type") from err
+
+        try:
+            return np.broadcast_to(values, shape)
+        except ValueError as err:
+            logger.error(f"{name} should have shape {shape}, not {values.shape}")
+            raise TypeError(f"{name} bad shape") from err
+
     def move(self, time, coords=None):
         self.move_and_focus(time, None, None, coords)
 
     def move_and_zoom(self, time, zoom, coords=None):
-        old_dx, old_dy = self._dxs[-1], self._dys[-1]
+        old_dx, old_dy = self._dx[self._n - 1], self._dy[self._n - 1]
         self.move_and_focus(time, old_dx / zoom, old_dy / zoom, coords)
 
     def move_and_focus(self, time, dx=None, dy=None, coords=None):
         self._sanitize_time(time)
-        self._sanitize_coords(coords)
 
+        last = self._n - 1
         if coords is None:
-            coords = self._coords[-1]
+            coords = self._x[last], self._y[last]
+        else:
+            self._sanitize_coords(coords)
 
         if dx is None:
-            dx = self._dxs[-1]
+            dx = self._dx[last]
         if dy is None:
-            dy = self._dys[-1]
+            dy = self._dy[last]
+
+        self._extend([self._next_time(time)], [coords[0]], [coords[1]], [dx], [dy])
 
-        self._coords.append(coords)
-        self._dxs.append(dx)
-        self._dys.append(dy)
-        self._add_time(time)
+    def move_many(self, times, coords=None, dxs=None, dys=None):
+        """Add several moves at once, same as calling :meth:`Path.move_and_focus` for each of them
+
+        Parameters
+        ----------
+        times : numpy.ndarray
+            time of each move, shape (N,). Same meaning as `time` in :meth:`Path.move_and_focus`
+        coords : numpy.ndarray, optional
+            position (x, y) at the end of each move, shape (N, 2) or (2,). By default the camera doesn't move
+        dxs : numpy.ndarray or float, optional
+            horizontal half size of the camera at the end of each move. By default it doesn't change
+        dys : numpy.ndarray or float, optional
+            vertical half size of the camera at the end of each move. By default it doesn't change
+
+        Raises
+        ------
+        TypeError
+            if times or other variables don't have the expected type or shape
+        """
+        times = np.asarray(times)
+        if times.ndim != 1:
+            logger.error(f"times should be a 1D array, not an array of shape {times.shape}")
+            raise TypeError("times bad shape")
+        n = times.size
+        if n == 0:
+            # nothing to add, the path and its caches stay valid
+            return
+
+        last = self._n - 1
+        if coords is None:
+            coords = self._x[last], self._y[last]
+        if dxs is None:
+            dxs = self._dx[last]
+        if dys is None:
+            dys = self._dy[last]
+
+        coords = self._sanitize_many("coords", coords, (n, 2))
+        dxs = self._sanitize_many("dxs", dxs, (n,))
+        dys = self._sanitize_many("dys", dys, (n,))
+
+        self._extend(self._next_times(times), coords[:, 0], coords[:, 1], dxs, dys)
+
+    def _extend(self, times, xs, ys, dxs, dys):
+        """add knots at the end of the buffers, doubling their size when full"""
+        n = self._n
+        end = n + len(times)
+        if end > self._t.size:
+            capacity = self._t.size
+            while capacity < end:
+                capacity *= 2
+            for name in ("_t", "_x", "_y", "_dx", "_dy"):
+                buffer = getattr(self, name)
+                grown = np.empty(capacity, dtype=buffer.dtype)
+                grown[:n] = buffer[:n]
+                setattr(self, name, grown)
+
+        # keep the finest time unit seen (datetime64[D] then datetime64[h] for instance), so dates are not
+        # truncated and don't overflow like they would if everything was converted to ns
+        dtype = np.promote_types(self._t.dtype, np.asarray(times).dtype)
+        if dtype != self._t.dtype:
+            t = np.empty(self._t.size, dtype=dtype)
+            t[:n] = self._t[:n]
+            self._t = t
+
+        self._t[n:end] = times
+        self._x[n:end] = xs
+        self._y[n:end] = ys
+        self._dx[n:end] = dxs
+        self._dy[n:end] = dys
+        self._n = end
+        # cached paths are outdated
+        self._path_cache = None
+        # the last knot was an end (null slope), its slope changes so its segment should be recomputed
+        self._n_coeffs = min(self._n_coeffs, max(n - 2, 0))
+
+    def _knots(self):
+        # views on the buffers, no copy
+        n = self._n
+        return self._x[:n], self._y[:n], self._dx[:n], self._dy[:n], self._t[:n]
 
     def _merge_moves(self, dt):
-        x, y = np.array(self._coords).T
-        dates = np.array(self._times)
-        dxs = np.array(self._dxs)
-        dys = np.array(self._dys)
+        x, y, dxs, dys, dates = self._knots()
         time_coords = np.arange(dates[0], dates[-1], dt)
         return x, y, dxs, dys, dates, time_coords
 
     def _interp_moves(self, x, y, dxs, dys, dates, new_dates):
         # convert to float for interpolation
         int_new_dates = new_dates.astype(float)
-        # force both dates to have the same datetime type (s, ms, ns, ...)
-        int_dates = dates.astype(new_dates.dtype).astype(float)
-
-        def build_dxdy(x, y):
-            dxdy = np.zeros(y.size)
-
-            # slope before point
-            dy_b = np.diff(y[:-1]) / np.diff(x[:-1])
-            # slope after point
-            dy_a = np.diff(y[1:]) / np.diff(x[1:])
-
-            # slope should be 0 everythere except :
-            #   - we are strictly increasing (or decreasing) on the 3 consecutives points (before, within and after)
-            dxdy[1:-1] = np.where((dy_b * dy_a > 0), np.mean([dy_b, dy_a], axis=0), 0)
-            return dxdy
+        # new_dates has the finest unit of dates and dt : usually the unit of dates, so there is no cast
+        int_dates = dates.astype(new_dates.dtype, copy=False).astype(np.float64)
 
         # cubic hermite splice is used because it gives a result which is :
         #   continuous
         #   first derivative is continuous too
         # => it gives you a nice path without spike deplacements, smooth acceleration and decelerations
-        f = interpolate.CubicHermiteSpline(int_dates, x, dydx=build_dxdy(int_dates, x))
-        X = f(int_new_dates)
+        # all 4 variables share the same dates, so they are interpolated together
+        if int_dates.size < 3:
+            # slopes are 0 at both ends, so the hermite spline between 2 knots is a smoothstep
+            values = np.column_stack([x[[0, -1]], y[[0, -1]], dxs[[0, -1]], dys[[0, -1]]])
+            s = (int_new_dates - int_dates[0]) / (int_dates[-1] - int_dates[0])
+            w = (s * s * (3 - 2 * s))[:, None]
+            X, Y, new_dx, new_dy = (values[0] + (values[-1] - values[0]) * w).T
 
-        f = interpolate.CubicHermiteSpline(int_dates, y, dydx=build_dxdy(int_dates, y))
-        Y = f(int_new_dates)
+        else:
+            coeffs = self._segment_coeffs(int_dates, new_dates.dtype, x, y, dxs, dys)
+            X, Y, new_dx, new_dy = _hermite_eval(int_dates, coeffs, int_new_dates).T
 
-        f = interpolate.CubicHermiteSpline(int_dates, dxs, dydx=build_dxdy(int_dates, dxs))
-        new_dx = f(int_new_dates)
-        f = interpolate.CubicHermiteSpline(int_dates, dys, dydx=build_dxdy(int_dates, dys))
-        new_dy = f(int_new_dates)
+        # results are cached and shared between calls, they should not be modified
+        for arr in (new_dates, X, Y, new_dx, new_dy):
+            arr.flags.writeable = False
         return new_dates, X, Y, new_dx, new_dy
 
+    # slopes are close to the ones of scipy.interpolate.PchipInterpolator, but it is not used on purpose :
+    #   - pchip estimates a non null slope at both ends, so the camera would not start and stop at rest
+    #   - pchip uses a harmonic mean of slopes, which changes the path of existing animations
+    @classmethod
+    def _build_dxdy(cls, y, dx_b, dx_a):
+        dxdy = np.empty(y.shape)
+        # camera starts and stops at rest
+        dxdy[[0, -1]] = 0
+
+        # slope before point
+        dy_b = (y[1:-1] - y[:-2]) / dx_b
+        # slope after point
+        dy_a = (y[2:] - y[1:-1]) / dx_a
+
+        mean = dy_b + dy_a
+        mean *= 0.5
+        # slope should be 0 everythere except :
+        #   - we are strictly increasing (or decreasing) on the 3 consecutives points (before, within and after)
+        dxdy[1:-1] = np.where(dy_b * dy_a > 0, mean, 0)
+        return dxdy
+
+    def _segment_coeffs(self, int_dates, unit, x, y, dxs, dys):
+        """hermite coefficients of all segments, only the segments changed since the last call are computed
+
+        `unit` is the dtype `int_dates` were converted from. If it changes (finer dates added, or finer `dt`),
+        all coefficients are recomputed.
+
+        Returns
+        -------
+        tuple
+            c0, c1, c2, c3, each of shape (N-1, 4)
+        """
+        n_seg = int_dates.size - 1
+        if unit != self._coeffs_unit:
+            self._n_coeffs = 0
+            self._coeffs_unit = unit
+        start = self._n_coeffs
+        if start < n_seg:
+            if self._coeffs.shape[1] < n_seg:
+                grown = np.empty((4, 2 * n_seg, 4), dtype=np.float64)
+                grown[:, :start] = self._coeffs[:, :start]
+                self._coeffs = grown
+
+            # segments from `start` need the slopes from knot `start`, which depends on the knot before
+            lo = max(start - 1, 0)
+            values = np.column_stack([x[lo:], y[lo:], dxs[lo:], dys[lo:]])
+            dates = int_dates[lo:]
+            # time steps between knots, shared by all variables
+            dx_dates = (dates[1:] - dates[:-1])[:, None]
+            dydx = self._build_dxdy(values, dx_dates[:-1], dx_dates[1:])
+            coeffs = self._hermite_coeffs(dx_dates, values, dydx)
+
+            self._coeffs[:, start:n_seg] = np.stack(coeffs)[:, start - lo :]
+            self._n_coeffs = n_seg
+        return tuple(self._coeffs[:, :n_seg])
+
+    @classmethod
+    def _hermite_coeffs(cls, h, values, dydx):
+        """polynomial coefficients of each segment of a cubic hermite spline
+
+        On segment `i`, the spline is `c0 + c1*u + c2*u**2 + c3*u**3` with `u = t - dates[i]`
+
+        Parameters
+        ----------
+        h : numpy.ndarray
+            time steps between knots `dates[1:] - dates[:-1]`, shape (N-1, 1)
+        values : numpy.ndarray
+            values at knots, shape (N, M)
+        dydx : numpy.ndarray
+            first derivative at knots, shape (N, M)
+
+        Returns
+        -------
+        tuple
+            c0, c1, c2, c3, each of shape (N-1, M)
+        """
+        dv = (values[1:] - values[:-1]) / h
+        c3 = (dydx[:-1] + dydx[1:] - 2 * dv) / h**2
+        c2 = (3 * dv - 2 * dydx[:-1] - dydx[1:]) / h
+        return values[:-1], dydx[:-1], c2, c3
+
+    def _interp(self, dt):
+        """interpolated path for this `dt`, cached until a knot is added or another `dt` is used
+
+        Returns
+        -------
+        tuple
+            new_dates, X, Y, new_dx, new_dy (read-only arrays)
+        """
+        # np.timedelta64(1, "h") == np.timedelta64(60, "m") while the dates computed have different units,
+        # so dt is identified by its raw value and dtype.
+        # only the last path is kept : compute_path(dt) then plot_moves(dt) use the same one, and trying
+        # several dt doesn't keep every path in memory
+        raw_dt = np.asarray(dt)
+        key = raw_dt.dtype.str, raw_dt.tobytes()
+        if self._path_cache is None or self._path_cache[0] != key:
+            self._path_cache = key, self._interp_moves(*self._merge_moves(dt))
+        return self._path_cache[1]
+
     def _compute_path(self, dt):
         """compute path for the required points of interests
 
@@ -148,23 +375,29 @@ class Path:
                     if dates is an int, the speed will be `degrees / images`
 
         """
-        x, y, dxs, dys, dates, new_dates = self._merge_moves(dt)
-        new_dates, X, Y, new_dx, new_dy = self._interp_moves(x, y, dxs, dys, dates, new_dates)
-
-        length = np.zeros(X.shape, dtype=np.float64)
-
-        dist = np.sqrt((X[1:] - X[:-1]) ** 2 + (Y[1:] - Y[:-1]) ** 2)
-        length[1:] = dist
-
-        cartopy_extent = np.array([X - new_dx, X + new_dx, Y - new_dy, Y + new_dy]).T
-        return new_dates, cartopy_extent, length
+        new_dates, X, Y, new_dx, new_dy = self._interp(dt)
+
+        # no displacement for the first image, `[:1]` keeps it working on empty paths
+        length = np.empty(X.shape, dtype=np.float64)
+        length[:1] = 0
+        np.hypot(np.diff(X), np.diff(Y), out=length[1:])
+
+        # [x0, x1, y0, y1] written directly in a C-contiguous buffer
+        cartopy_extent = np.empty((X.size, 4), dtype=np.float64)
+        np.subtract(X, new_dx, out=cartopy_extent[:, 0])
+        np.add(X, new_dx, out=cartopy_extent[:, 1])
+        np.subtract(Y, new_dy, out=cartopy_extent[:, 2])
+        np.add(Y, new_dy, out=cartopy_extent[:, 3])
+        # new_dates is the cached (read-only) array, callers get their own copy
+        return new_dates.copy(), cartopy_extent, length
 
     ### VISUALISATION ###
     #####################
 
     def _build_xarray(self, dt, variables, derivative=False):
-        x, y, dxs, dys, dates, new_dates = self._merge_moves(dt)
-        new_dates, X, Y, new_dx, new_dy = self._interp_moves(x, y, dxs, dys, dates, new_dates)
+        # only wraps the cached arrays, no interpolation if compute_path was called with the same dt
+        x, y, dxs, dys, dates = self._knots()
+        new_dates, X, Y, new_dx, new_dy = self._interp(dt)
 
         dates = dates.astype("datetime64[ns]")
         new_dates = new_dates.astype("datetime64[ns]")
@@ -180,10 +413,13 @@ class Path:
             ds["dy"] = (["time"], (new_dy[1:] - new_dy[:-1]) / dtime, kw)
             ds["time"] = (["time"], new_dates[1:])
             ds = ds.set_coords(["time"])  # .rename({"time": "time"})
-            ds2 = ds.interp(time=dates).rename({"time": "old_time"})
 
-            for var in ds2.variables:
-                ds[var + "_old"] = ds2[var]
+            # derivative at the original dates, taken at the first interpolated date after each of them
+            idx = np.clip(np.searchsorted(new_dates[1:], dates), 0, new_dates.size - 2)
+            for var in ["x", "y", "dx", "dy"]:
+                ds[var + "_old"] = (["old_time"], ds[var].values[idx], kw)
+            ds["old_time"] = (["old_time"], dates)
+            ds = ds.set_coords(["old_time"])
 
         else:
             ds["x_old"] = (["old_time"], x, kw)
@@ -239,7 +475,7 @@ class Path:
             if i < len(variables) - 1:
                 ax.set_xticklabels([])
             ax.legend()
-        logger.error(str(ds))
+        logger.debug("%s", ds)
         return fig, ax
 
 
@@ -267,8 +503,8 @@ class TimePath(Path):
             logger.error(f"dt shoud be type `np.timedelta64`, not {type(t)}")
             raise TypeError("dt bad type")
 
-    def _add_time(self, t):
-        last_date = self._times[-1]
+    def _next_time(self, t):
+        last_date = self._t[self._n - 1]
         if np.issubdtype(t.dtype, np.datetime64):
             date = t
 
@@ -276,10 +512,32 @@ class TimePath(Path):
             # _dt is not np.datetime64, so its a np.timedelta64 (cf _sanitize_time)
             date = last_date + t
 
-        if date < last_date:
-            raise Exception(f"time specified '{t}' make the date '{date}' before last date specified '{last_date}'")
+        # dates should be strictly increasing, a null move would give a null segment in the interpolation
+        if date <= last_date:
+            raise Exception(f"time specified '{t}' make the date '{date}' not after last date specified '{last_date}'")
+
+        return date
 
-        self._times.append(date)
+    def _next_times(self, times):
+        last_date = self._t[self._n - 1]
+        if np.issubdtype(times.dtype, np.datetime64):
+            dates = times
+
+        elif np.issubdtype(times.dtype, np.timedelta64):
+            dates = last_date + np.cumsum(times)
+
+        else:
+            logger.error(f"times shoud be an array of `np.datetime64` or `np.timedelta64`, not {times.dtype}")
+            raise TypeError("times bad type")
+
+        previous = np.concatenate([[last_date], dates[:-1]])
+        if np.any(dates <= previous):
+            i = np.argmax(dates <= previous)
+            raise Exception(
+                f"time specified '{times[i]}' make the date '{dates[i]}' not after last date specified '{previous[i]}'"
+            )
+
+        return dates
 
     def compute_path(self, dt):
         self._sanitize_dt(dt)
@@ -307,9 +565,21 @@ class FramePath(Path):
             logger.error("time should be a int >= 1")
             raise TypeError("time bad value")
 
-    def _add_time(self, t):
-        old_frame = self._times[-1]
-        self._times.append(t + old_frame)
+    def _next_time(self, t):
+        old_frame = self._t[self._n - 1]
+        return t + old_frame
+
+    def _next_times(self, times):
+        if not np.issubdtype(times.dtype, np.integer):
+            logger.error(f"times shoud be an array of `int`, not {times.dtype}")
+            raise TypeError("times bad type")
+
+        if np.any(times < 1):
+            logger.error("times should be int >= 1")
+            raise TypeError("times bad value")
+
+        old_frame = self._t[self._n - 1]
+        return old_frame + np.cumsum(times)
 
     def compute_path(self):
         return self._compute_path(1)
@@ -41,6 +41,18 @@ class Test_TimePath:
         with pytest.raises(Exception):
             tp.move(np.datetime64("now") - np.timedelta64(15, "s"), (1, 1))
 
+    def test_wrong_time_null_move(self):
+        """fail because a move should take some time"""
+
+        tp = anim.path.TimePath((0, 0), 0, 0, np.datetime64("2024-01-01T01:11:01"))
+        tp.move(np.timedelta64(1, "h"), (1, 1))
+
+        with pytest.raises(Exception):
+            tp.move(np.timedelta64(0, "h"), (5, 5))
+
+        with pytest.raises(Exception):
+            tp.move_many(np.array([1, 0, 1], dtype="timedelta64[D]"), coords=[(1, 1), (2, 2), (3, 3)])
+
     def test_time_1(self):
         """test time interpolation"""
 
@@ -65,6 +77,23 @@ class Test_TimePath:
         ref = np.arange(t0, t0 + np.timedelta64(7), np.timedelta64(1, "h"))
         np.testing.assert_array_equal(times, ref)
 
+    def test_time_unit(self):
+        """dates should be returned with the unit of t0, and work outside the datetime64[ns] range"""
+
+        t0 = np.datetime64("2500-01-01T00:00")
+        tp = anim.path.TimePath((0, 0), 1, 1, t0)
+        tp.move(np.timedelta64(1, "D"), (0, 24))
+        tp.move(np.timedelta64(1, "D"), (24, 24))
+        times, extents, _ = tp.compute_path(np.timedelta64(1, "h"))
+
+        assert times.dtype == t0.dtype
+        np.testing.assert_array_equal(times, np.arange(t0, t0 + np.timedelta64(2, "D"), np.timedelta64(1, "h")))
+        np.testing.assert_allclose(extents[24], np.array([-1, 1, 23, 25]))
+
+        # a dt finer than the dates unit gives the same positions at common dates
+        _, extents_30m, _ = tp.compute_path(np.timedelta64(1800, "s"))
+        np.testing.assert_allclose(extents_30m[::2], extents)
+
     def test_path_with_no_moving(self):
         """test path empty"""
 
@@ -100,6 +129,89 @@ class Test_TimePath:
         ref = np.arange(t0, t0 + np.timedelta64(3, "D"), np.timedelta64(1, "h"))
         np.testing.assert_array_equal(times, ref)
 
+    def test_path_with_different_dt(self):
+        """same path computed with different dt should give the same positions at common dates"""
+
+        t0 = np.datetime64("2024-01-01T03:10:05")
+        tp = anim.path.TimePath((0, 0), 1, 1, t0)
+        tp.move(np.timedelta64(1, "D"), (10, 24))
+        tp.move(np.timedelta64(2, "D"), (48, 12))
+        _, extents_1h, _ = tp.compute_path(np.timedelta64(1, "h"))
+        _, extents_30m, _ = tp.compute_path(np.timedelta64(30, "m"))
+
+        np.testing.assert_allclose(extents_30m[::2], extents_1h)
+
+    def test_time_finer_unit(self):
+        """dates with a finer unit than t0 should not be truncated"""
+
+        t0 = np.datetime64("2024-01-01T01:11:01")
+        tp = anim.path.TimePath((0, 0), 0, 0, t0)
+        tp.move(np.timedelta64(1500, "ms"), (0, 0))
+        times, _, _ = tp.compute_path(np.timedelta64(500, "ms"))
+
+        ref = np.arange(t0, t0 + np.timedelta64(1500, "ms"), np.timedelta64(500, "ms"))
+        np.testing.assert_array_equal(times, ref)
+
+    def test_path_updated_after_move(self):
+        """a path already computed should be recomputed when a move is added"""
+
+        t0 = np.datetime64("2024-01-01T03:10:05")
+        tp = anim.path.TimePath((0, 0), 1, 1, t0)
+        tp.move(np.timedelta64(1, "D"), (0, 24))
+        times_1, extents_1, _ = tp.compute_path(np.timedelta64(1, "h"))
+        tp.move(np.timedelta64(1, "D"), (48, 24))
+        times_2, extents_2, _ = tp.compute_path(np.timedelta64(1, "h"))
+
+        assert times_1.size == 24
+        assert times_2.size == 48
+        np.testing.assert_array_equal(extents_2[24], np.array([-1, 1, 23, 25]))
+
+    def test_move_many(self):
+        """moves added at once should give the same path as moves added one by one"""
+
+        t0 = np.datetime64("2024-01-01T03:10:05")
+        tp_1 = anim.path.TimePath((0, 0), 1, 1, t0)
+        tp_1.move(np.timedelta64(1, "D"), (0, 24))
+        tp_1.move_and_focus(np.timedelta64(2, "D"), 2, 3, (48, 24))
+        tp_1.move(np.timedelta64(1, "D"))
+
+        tp_2 = anim.path.TimePath((0, 0), 1, 1, t0)
+        tp_2.move_many(
+            np.array([1, 2, 1], dtype="timedelta64[D]"),
+            coords=[(0, 24), (48, 24), (48, 24)],
+            dxs=[1, 2, 2],
+            dys=[1, 3, 3],
+        )
+
+        times_1, extents_1, _ = tp_1.compute_path(np.timedelta64(1, "h"))
+        times_2, extents_2, _ = tp_2.compute_path(np.timedelta64(1, "h"))
+        np.testing.assert_array_equal(times_1, times_2)
+        np.testing.assert_array_equal(extents_1, extents_2)
+
+    def test_wrong_move_many(self):
+        """fail because dates should be increasing, and coords should have shape (N, 2)"""
+
+        t0 = np.datetime64("2024-01-01T03:10:05")
+        tp = anim.path.TimePath((0, 0), 1, 1, t0)
+
+        with pytest.raises(Exception):
+            tp.move_many(np.array([t0 + np.timedelta64(1, "h"), t0]))
+
+        with pytest.raises(TypeError):
+            tp.move_many(np.array([1, 2], dtype="timedelta64[h]"), coords=[(0, 1, 2), (0, 1, 2)])
+
+    def test_computed_path_is_writable(self):
+        """arrays returned should be owned by the caller, even when the path is cached"""
+
+        t0 = np.datetime64("2024-01-01T03:10:05")
+        tp = anim.path.TimePath((0, 0), 1, 1, t0)
+        tp.move(np.timedelta64(1, "D"), (0, 24))
+        times, _, _ = tp.compute_path(np.timedelta64(1, "h"))
+        times -= np.timedelta64(1, "h")
+
+        times_2, _, _ = tp.compute_path(np.timedelta64(1, "h"))
+        assert times_2[0] == t0
+
 
 class Test_FramePath:
     def test_setup(self):
@@ -137,3 +249,93 @@ class Test_FramePath:
         np.testing.assert_array_equal(extents[0], np.array([-1, 1, -1, 1]))
         np.testing.assert_array_equal(extents[10], np.array([-1, 1, 23, 25]))
         np.testing.assert_array_equal(extents[30], np.array([47, 49, 23, 25]))
+
+    def test_path_with_two_points(self):
+        """path between 2 points should start and stop smoothly"""
+        tp = anim.path.FramePath((0, 0), 1, 1)
+        tp.move(10, (10, 0))
+        _, extents, _ = tp.compute_path()
+
+        np.testing.assert_allclose(extents[0], np.array([-1, 1, -1, 1]))
+        np.testing.assert_allclose(extents[5], np.array([4, 6, -1, 1]))
+        np.testing.assert_allclose(extents[2, 0] + 1, 10 * 0.2**2 * (3 - 2 * 0.2))
+
+    def test_move_many(self):
+        """moves added at once should give the same path as moves added one by one"""
+        tp_1 = anim.path.FramePath((0, 0), 1, 1)
+        tp_1.move(10, (0, 24))
+        tp_1.move(20, (48, 24))
+        tp_1.move(10)
+
+        tp_2 = anim.path.FramePath((0, 0), 1, 1)
+        tp_2.move_many([10, 20, 10], coords=[(0, 24), (48, 24), (48, 24)])
+
+        np.testing.assert_array_equal(tp_1.compute_path()[1], tp_2.compute_path()[1])
+
+    def test_path_starts_and_stops_at_rest(self):
+        """camera should accelerate at the beginning of the path, and decelerate at the end"""
+        tp = anim.path.FramePath((0, 0), 1, 1)
+        tp.move(10, (10, 0))
+        tp.move(10, (20, 0))
+        tp.move(10, (30, 0))
+        _, _, speed = tp.compute_path()
+
+        assert speed[0] == 0
+        assert np.all(np.diff(speed[:6]) > 0)
+        assert np.all(np.diff(speed[-5:]) < 0)
+
+    def test_path_computed_while_moving(self):
+        """path computed after each move should be the same as the path computed once at the end"""
+        rng = np.random.default_rng(0)
+        frames = rng.integers(1, 10, 40)
+        coords = rng.normal(size=(40, 2)) * 10
+
+        tp_1 = anim.path.FramePath((0, 0), 1, 1)
+        for frame, coord in zip(frames, coords):
+            tp_1.move(int(frame), tuple(coord))
+            _, extents_1, _ = tp_1.compute_path()
+
+        tp_2 = anim.path.FramePath((0, 0), 1, 1)
+        tp_2.move_many(frames, coords)
+        _, extents_2, _ = tp_2.compute_path()
+
+        np.testing.assert_allclose(extents_1, extents_2)
+
+    def test_wrong_coords_move(self):
+        """fail because coords should be tuple(x, y)"""
+
+        tp = anim.path.FramePath((0, 0), 0, 0)
+
+        with pytest.raises(TypeError):
+            tp.move(10, (1, 2, 3))
+
+    def test_path_with_int32_frames(self):
+        """frames given as int32 (numpy default int on some platforms) should give the same path"""
+        tp_1 = anim.path.FramePath((0, 0), 1, 1)
+        tp_1.move(10, (0, 24))
+        tp_1.move(20, (48, 24))
+
+        tp_2 = anim.path.FramePath((0, 0), 1, 1)
+        tp_2.move_many(np.array([10, 20], dtype=np.int32), coords=[(0, 24), (48, 24)])
+
+        np.testing.assert_array_equal(tp_1.compute_path()[1], tp_2.compute_path()[1])
+
+    def test_move_many_empty(self):
+        """empty batch of moves should not change the path"""
+        tp = anim.path.FramePath((0, 0), 1, 1)
+        tp.move(10, (0, 24))
+        _, extents_1, _ = tp.compute_path()
+        tp.move_many([])
+        _, extents_2, _ = tp.compute_path()
+
+        np.testing.assert_array_equal(extents_1, extents_2)
+
+    def test_wrong_move_many(self):
+        """fail because dxs should be numbers"""
+        tp = anim.path.FramePath((0, 0), 1, 1)
+
+        with pytest.raises(TypeError, match="dxs bad type"):
+            tp.move_many([5, 5], dxs=["a", "b"])
+
+        with pytest.raises(TypeError, match="dxs bad shape"):
+            tp.move_many([5, 5], dxs=[1, 2, 3])